@@ -1,22 +1,32 @@
 import os
+import re
 import sys
+import time
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set, Tuple
 from pathlib import Path
 
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:
+    # Optional faster event loop (not available on Windows)
+    uvloop = None
+
 # Add parent directory to path for imports
 sys.path.append(str(Path(__file__).parent.parent))
 
-from reflectpause_core import check, generate_prompt
+from reflectpause_core import check, check_batch, generate_prompt
 from reflectpause_core.logging import DecisionType, log_decision
 from storage import MessageStorage
-from config import BotConfig
+from config import load_config
 
 # Load environment variables
 load_dotenv()
@@ -24,6 +34,40 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Reactions offered on every reflection prompt: post anyway, edit, cancel
+PROMPT_REACTIONS = ("✅", "✏️", "❌")
+
+# Most messages handed to check_batch in one call
+TOXICITY_BATCH_SIZE = 32
+
+# ASCII messages shorter than this ("k", "lol") are not worth classifying
+MIN_CHECK_LENGTH = 4
+
+# Text made only of whitespace, punctuation and symbols, emoji included
+_NO_WORDS_RE = re.compile(r"^[\W_]*$")
+
+@dataclass(slots=True)
+class PendingEntry:
+    """A deleted message waiting on its author's reflection prompt decision"""
+    content: str
+    channel_id: int
+    guild_id: int
+    author_id: int
+    attachments: Tuple[str, ...]
+    can_send: bool  # bot may post in channel_id; refreshed on channel updates
+    ts: float = 0.0  # time.monotonic() when the prompt was sent
+    storage_id: Optional[int] = None
+    
+    def to_storage(self) -> Dict[str, Any]:
+        """Message fields persisted by MessageStorage"""
+        return {
+            'content': self.content,
+            'channel_id': self.channel_id,
+            'guild_id': self.guild_id,
+            'author_id': self.author_id,
+            'attachments': list(self.attachments)
+        }
+
 class ReflectivePauseBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -31,35 +75,64 @@ class ReflectivePauseBot(commands.Bot):
         intents.reactions = True
         
         super().__init__(
-            command_prefix='!pause ',
+            # Admin commands are slash commands; no message is parsed for a prefix
+            command_prefix=commands.when_mentioned,
             intents=intents,
-            help_command=None
+            help_command=None,
+            # Reactions are handled from raw events, so no message cache is needed
+            max_messages=None
         )
         
-        self.config = BotConfig()
-        self.storage = MessageStorage()
-        self.pending_messages: Dict[int, Tuple[discord.Message, datetime]] = {}
+        self.config = load_config()
+        self.storage = MessageStorage(
+            cleanup_interval=self.config.cleanup_interval,
+            message_retention=self.config.message_retention
+        )
+        self.pending_messages: Dict[int, PendingEntry] = {}
+        # (ts, dm_message_id) in insertion order, so expiry only walks the
+        # entries that are actually old
+        self._pending_order: Deque[Tuple[float, int]] = deque()
+        # Toxicity checks are CPU bound and would otherwise block the event loop
+        self._tox_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count(),
+            thread_name_prefix="toxicity"
+        )
+        # Messages waiting to be classified by the batching worker
+        self._check_queue: asyncio.Queue = asyncio.Queue()
+        self._check_worker: Optional[asyncio.Task] = None
+        # Users with an edit session open; removed again when the session ends
+        self._editing_users: Set[int] = set()
         
     async def setup_hook(self):
         await self.storage.initialize()
+        self._prompt_embed_template = self._create_prompt_embed_template()
+        self._check_worker = asyncio.create_task(self._toxicity_batch_worker())
         # Load admin commands
         await self.load_extension('commands')
+        await self.tree.sync()
         logger.info("Bot setup complete")
         
+    async def close(self):
+        if self._check_worker is not None:
+            self._check_worker.cancel()
+        await super().close()
+        self._tox_pool.shutdown(wait=False, cancel_futures=True)
+        await self.storage.close()
+        
     async def on_ready(self):
         logger.info(f'{self.user} has connected to Discord!')
         logger.info(f'Bot is in {len(self.guilds)} guilds')
         
-        # Clean up old pending messages
-        self.cleanup_pending_messages.start()
+        # Clean up old pending messages (on_ready fires again after reconnects)
+        if not self.cleanup_pending_messages.is_running():
+            # Sweep on the same schedule as storage, so both expire together
+            self.cleanup_pending_messages.change_interval(seconds=self.config.cleanup_interval)
+            self.cleanup_pending_messages.start()
         
     async def on_message(self, message: discord.Message):
         if message.author.bot:
             return
             
-        # Process commands first
-        await self.process_commands(message)
-        
         # Skip if in DM or bot disabled for this guild
         if isinstance(message.channel, discord.DMChannel):
             return
@@ -67,190 +140,289 @@ class ReflectivePauseBot(commands.Bot):
         if not await self.storage.is_enabled(message.guild.id):
             return
             
+        # Skip text that cannot be toxic: no words at all (including
+        # attachment-only messages), bare numbers, or very short ASCII. Short
+        # CJK text can still be an insult, so the length cut is ASCII only.
+        content = message.content.strip()
+        if (_NO_WORDS_RE.match(content) or content.isdecimal()
+                or (len(content) < MIN_CHECK_LENGTH and content.isascii())):
+            return
+            
         try:
             # Check if message needs reflection pause
-            needs_pause = check(message.content)
+            needs_pause = await self.check_toxicity_batched(message.content)
             
             if needs_pause:
                 # Store original message
-                original_data = {
-                    'content': message.content,
-                    'channel_id': message.channel.id,
-                    'guild_id': message.guild.id,
-                    'author_id': message.author.id,
-                    'attachments': [att.url for att in message.attachments],
-                    'timestamp': datetime.utcnow()
-                }
+                entry = PendingEntry(
+                    content=message.content,
+                    channel_id=message.channel.id,
+                    guild_id=message.guild.id,
+                    author_id=message.author.id,
+                    attachments=tuple(att.url for att in message.attachments),
+                    can_send=message.channel.permissions_for(message.guild.me).send_messages
+                )
                 
                 # Delete the message
                 await message.delete()
                 
                 # Send reflection prompt
-                await self.send_reflection_prompt(message.author, original_data)
+                await self.send_reflection_prompt(message.author, entry)
                 
         except discord.Forbidden:
-            logger.warning(f"Missing permissions to delete message in {message.guild.name}")
+            logger.warning("Missing permissions to delete message in %s", message.guild.name)
         except Exception as e:
-            logger.error(f"Error processing message: {e}")
+            logger.error("Error processing message: %s", e)
             
-    async def send_reflection_prompt(self, user: discord.User, message_data: dict):
+    async def check_toxicity(self, text: str) -> bool:
+        """Run the toxicity check in the worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._tox_pool, check, text)
+        
+    async def check_toxicity_batched(self, text: str) -> bool:
+        """Queue a toxicity check to be classified with other pending messages"""
+        future = asyncio.get_running_loop().create_future()
+        await self._check_queue.put((text, future))
+        return await future
+        
+    async def _toxicity_batch_worker(self):
+        """Classify queued messages in batches with check_batch"""
+        loop = asyncio.get_running_loop()
+        queue = self._check_queue
+        
+        while True:
+            # Wait for one message, then take whatever else piled up meanwhile
+            items = [await queue.get()]
+            while len(items) < TOXICITY_BATCH_SIZE and not queue.empty():
+                items.append(queue.get_nowait())
+                
+            texts = [text for text, _ in items]
+            try:
+                results = await loop.run_in_executor(self._tox_pool, check_batch, texts)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(items, results):
+                    if not future.done():
+                        future.set_result(result)
+                        
+    @staticmethod
+    def _create_prompt_embed_template() -> dict:
+        """Build the static parts of the reflection prompt embed once"""
+        embed = discord.Embed(
+            title="🛑 Reflective Pause",
+            description="Before we share that message, let's take a moment to reflect:",
+            color=0x00ff9f
+        )
+        
+        # Placeholder, replaced by the rotated CBT question on every prompt
+        embed.add_field(
+            name="1️⃣ Accuracy & Fairness",
+            value="\u200b",
+            inline=False
+        )
+        embed.add_field(
+            name="2️⃣ Potential Impact", 
+            value="Could this message harm someone or escalate conflict?",
+            inline=False
+        )
+        embed.add_field(
+            name="3️⃣ Self-Reflection",
+            value="Does this reflect the person you want to be?",
+            inline=False
+        )
+        embed.add_field(
+            name="📝 Your Options",
+            value="✅ **Post anyway** - Send the original message\n✏️ **Edit first** - Modify before posting\n❌ **Cancel** - Don't post this message",
+            inline=False
+        )
+        
+        embed.set_footer(text="This pause helps create healthier online conversations")
+        return embed.to_dict()
+        
+    def build_prompt_embed(self, question: str) -> discord.Embed:
+        """Create a reflection prompt embed from the prebuilt template"""
+        template = self._prompt_embed_template
+        fields = template['fields']
+        
+        # Embed.copy() shares field dicts, so give the question its own field
+        embed = discord.Embed.from_dict({
+            **template,
+            'fields': [{**fields[0], 'value': question}, *fields[1:]]
+        })
+        # The only wall-clock time the bot needs; bookkeeping uses time.monotonic()
+        embed.timestamp = discord.utils.utcnow()
+        return embed
+        
+    async def send_reflection_prompt(self, user: discord.User, entry: PendingEntry):
         try:
             # Generate CBT prompt
             prompt_data = generate_prompt("en")  # TODO: Add locale detection
             
-            embed = discord.Embed(
-                title="🛑 Reflective Pause",
-                description="Before we share that message, let's take a moment to reflect:",
-                color=0x00ff9f,
-                timestamp=datetime.utcnow()
-            )
-            
-            embed.add_field(
-                name="1️⃣ Accuracy & Fairness",
-                value=prompt_data.question,
-                inline=False
-            )
-            embed.add_field(
-                name="2️⃣ Potential Impact", 
-                value="Could this message harm someone or escalate conflict?",
-                inline=False
-            )
-            embed.add_field(
-                name="3️⃣ Self-Reflection",
-                value="Does this reflect the person you want to be?",
-                inline=False
-            )
-            embed.add_field(
-                name="📝 Your Options",
-                value="✅ **Post anyway** - Send the original message\n✏️ **Edit first** - Modify before posting\n❌ **Cancel** - Don't post this message",
-                inline=False
-            )
-            
-            embed.set_footer(text="This pause helps create healthier online conversations")
+            embed = self.build_prompt_embed(prompt_data.question)
             
             dm_message = await user.send(embed=embed)
             
-            # Add reaction options
-            for emoji in ["✅", "✏️", "❌"]:
-                await dm_message.add_reaction(emoji)
-                
-            # Store message data for later retrieval
-            message_id = await self.storage.store_pending_message(user.id, message_data)
-            self.pending_messages[dm_message.id] = (message_data, datetime.utcnow(), message_id)
+            # Register before awaiting anything else so an early reaction is not dropped
+            entry.ts = time.monotonic()
+            self.pending_messages[dm_message.id] = entry
+            self._pending_order.append((entry.ts, dm_message.id))
+            
+            # Add reaction options and persist the message concurrently
+            results, entry.storage_id = await asyncio.gather(
+                asyncio.gather(
+                    *(dm_message.add_reaction(emoji) for emoji in PROMPT_REACTIONS),
+                    return_exceptions=True
+                ),
+                self.storage.store_pending_message(user.id, entry.to_storage())
+            )
+            for emoji, result in zip(PROMPT_REACTIONS, results):
+                if isinstance(result, Exception):
+                    logger.warning("Failed to add reaction %s: %s", emoji, result)
             
         except discord.Forbidden:
-            logger.warning(f"Cannot send DM to {user.name}")
+            logger.warning("Cannot send DM to %s", user.name)
         except Exception as e:
-            logger.error(f"Error sending reflection prompt: {e}")
+            logger.error("Error sending reflection prompt: %s", e)
             
-    async def on_reaction_add(self, reaction: discord.Reaction, user: discord.User):
-        if user.bot:
+    async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent):
+        if payload.user_id == self.user.id:
             return
             
-        # Check if this is a reaction to a reflection prompt
-        if reaction.message.id not in self.pending_messages:
+        emoji = str(payload.emoji)
+        if emoji not in PROMPT_REACTIONS:
+            return
+            
+        # Claim the prompt before awaiting anything, so a second reaction
+        # (or one sent while an edit is open) cannot act on it as well
+        entry = self.pending_messages.pop(payload.message_id, None)
+        if entry is None:
             return
             
-        message_data, timestamp, storage_id = self.pending_messages[reaction.message.id]
-        
         try:
-            if reaction.emoji == "✅":
-                await self.handle_post_anyway(user, message_data, storage_id)
+            user = self.get_user(payload.user_id) or await self.fetch_user(payload.user_id)
+            
+            if emoji == "✅":
+                await self.handle_post_anyway(user, entry)
                 log_decision(DecisionType.CONTINUED_SENDING)
                 
-            elif reaction.emoji == "✏️":
-                await self.handle_edit_request(user, message_data, storage_id)
+            elif emoji == "✏️":
+                if not await self.handle_edit_request(user, entry):
+                    # Another edit is still open; leave this prompt answerable
+                    self.pending_messages[payload.message_id] = entry
+                    return
                 log_decision(DecisionType.EDITED_MESSAGE)
                 
-            elif reaction.emoji == "❌":
-                await self.handle_cancel(user, storage_id)
+            elif emoji == "❌":
+                await self.handle_cancel(user, entry)
                 log_decision(DecisionType.CANCELLED)
                 
             # Clean up
-            del self.pending_messages[reaction.message.id]
-            await self.storage.remove_pending_message(storage_id)
+            await self.storage.remove_pending_message(entry.storage_id)
             
         except Exception as e:
-            logger.error(f"Error handling reaction: {e}")
+            logger.error("Error handling reaction: %s", e)
             
-    async def handle_post_anyway(self, user: discord.User, message_data: dict, storage_id: int):
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel):
+        # Overwrites may have changed; refresh the cached permission of prompts for this channel
+        for entry in self.pending_messages.values():
+            if entry.channel_id == after.id:
+                entry.can_send = after.permissions_for(after.guild.me).send_messages
+                
+    async def handle_post_anyway(self, user: discord.User, entry: PendingEntry):
         try:
-            guild = self.get_guild(message_data['guild_id'])
-            channel = guild.get_channel(message_data['channel_id'])
+            channel = self.get_channel(entry.channel_id)
             
-            if channel and channel.permissions_for(guild.me).send_messages:
+            if channel and entry.can_send:
                 await channel.send(
-                    f"**{user.display_name}**: {message_data['content']}"
+                    f"**{user.display_name}**: {entry.content}"
                 )
                 await user.send("✅ Your message has been posted.")
             else:
                 await user.send("❌ Unable to post message - channel not found or no permissions.")
                 
         except Exception as e:
-            logger.error(f"Error posting message: {e}")
+            logger.error("Error posting message: %s", e)
             await user.send("❌ An error occurred while posting your message.")
             
-    async def handle_edit_request(self, user: discord.User, message_data: dict, storage_id: int):
-        embed = discord.Embed(
-            title="✏️ Edit Your Message",
-            description="Please send your edited message now. You have 5 minutes.",
-            color=0xffa500
-        )
-        embed.add_field(
-            name="Original Message",
-            value=f"```{message_data['content'][:1000]}```",
-            inline=False
-        )
+    async def handle_edit_request(self, user: discord.User, entry: PendingEntry) -> bool:
+        """Collect and post an edited message; returns False if an edit is already open"""
+        # One edit session per user keeps wait_for listeners from piling up
+        if user.id in self._editing_users:
+            await user.send("✏️ You already have an edit in progress. Finish it first, then react again.")
+            return False
+            
+        self._editing_users.add(user.id)
+        try:
+            embed = discord.Embed(
+                title="✏️ Edit Your Message",
+                description="Please send your edited message now. You have 5 minutes.",
+                color=0xffa500
+            )
+            embed.add_field(
+                name="Original Message",
+                value=f"```{entry.content[:1000]}```",
+                inline=False
+            )
         
-        await user.send(embed=embed)
+            await user.send(embed=embed)
         
-        # Wait for edited message
-        def check(m):
-            return m.author == user and isinstance(m.channel, discord.DMChannel)
+            # Wait for edited message
+            def check(m):
+                return m.author == user and isinstance(m.channel, discord.DMChannel)
             
-        try:
-            edited_msg = await self.wait_for('message', timeout=300.0, check=check)
+            try:
+                edited_msg = await self.wait_for('message', timeout=300.0, check=check)
             
-            # Post the edited message
-            guild = self.get_guild(message_data['guild_id'])
-            channel = guild.get_channel(message_data['channel_id'])
+                # Post the edited message
+                channel = self.get_channel(entry.channel_id)
             
-            if channel and channel.permissions_for(guild.me).send_messages:
-                await channel.send(
-                    f"**{user.display_name}**: {edited_msg.content}"
-                )
-                await user.send("✅ Your edited message has been posted.")
-            else:
-                await user.send("❌ Unable to post message - channel not found or no permissions.")
+                if channel and entry.can_send:
+                    await channel.send(
+                        f"**{user.display_name}**: {edited_msg.content}"
+                    )
+                    await user.send("✅ Your edited message has been posted.")
+                else:
+                    await user.send("❌ Unable to post message - channel not found or no permissions.")
                 
-        except asyncio.TimeoutError:
-            await user.send("⏰ Edit timeout - your message was not posted.")
+            except asyncio.TimeoutError:
+                await user.send("⏰ Edit timeout - your message was not posted.")
+        finally:
+            self._editing_users.discard(user.id)
             
-    async def handle_cancel(self, user: discord.User, storage_id: int):
+        return True
+        
+    async def handle_cancel(self, user: discord.User, entry: PendingEntry):
         await user.send("❌ Message cancelled - nothing was posted.")
         
-    @commands.loop(minutes=30)
+    @tasks.loop(minutes=30)
     async def cleanup_pending_messages(self):
-        cutoff = datetime.utcnow() - timedelta(hours=1)
-        expired = [
-            msg_id for msg_id, (_, timestamp, _) in self.pending_messages.items()
-            if timestamp < cutoff
-        ]
+        cutoff = time.monotonic() - self.config.message_retention
+        order = self._pending_order
+        expired = 0
         
-        for msg_id in expired:
-            del self.pending_messages[msg_id]
+        # Entries may already be gone if the user reacted in time
+        while order and order[0][0] < cutoff:
+            _, msg_id = order.popleft()
+            if self.pending_messages.pop(msg_id, None) is not None:
+                expired += 1
             
-        logger.info(f"Cleaned up {len(expired)} expired pending messages")
+        logger.info(f"Cleaned up {expired} expired pending messages")
 
 def main():
     # Initialize configuration and logging
-    config = BotConfig()
+    config = load_config()
     config.setup_logging()
     
     # Create bot instance
     bot = ReflectivePauseBot()
     
-    # Run the bot
+    # Run the bot on uvloop when it is installed
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        
     if not config.discord_token:
         logger.error("DISCORD_TOKEN not found in environment variables or config file")
         logger.info("Please set DISCORD_TOKEN environment variable or create config.json")
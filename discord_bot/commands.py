@@ -1,26 +1,44 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord import app_commands
 import logging
-from typing import Optional
+from typing import List, Optional
+
+from config import SUPPORTED_LOCALES
 
 logger = logging.getLogger(__name__)
 
+# Settings that /pause config can change
+CONFIG_SETTINGS = ['threshold', 'locale']
+
 class AdminCommands(commands.Cog):
+    pause_group = app_commands.Group(
+        name='pause',
+        description="Main command group for Reflective Pause Bot",
+        guild_only=True
+    )
+    
     def __init__(self, bot):
         self.bot = bot
         
-    @commands.group(name='pause', invoke_without_command=True)
-    async def pause_group(self, ctx):
-        """Main command group for Reflective Pause Bot"""
-        if ctx.invoked_subcommand is None:
-            await self.bot_help(ctx)
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        if isinstance(error, app_commands.MissingPermissions):
+            message = "❌ You need the Manage Server permission to use this command."
+        else:
+            logger.error(f"Error in command {interaction.command and interaction.command.qualified_name}: {error}")
+            message = "❌ An error occurred while running this command."
+            
+        if interaction.response.is_done():
+            await interaction.followup.send(message, ephemeral=True)
+        else:
+            await interaction.response.send_message(message, ephemeral=True)
             
     @pause_group.command(name='enable')
-    @commands.has_permissions(manage_guild=True)
-    async def enable_bot(self, ctx):
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def enable_bot(self, interaction: discord.Interaction):
         """Enable the Reflective Pause Bot for this server"""
-        await self.bot.storage.set_enabled(ctx.guild.id, True)
+        await self.bot.storage.set_enabled(interaction.guild_id, True)
         
         embed = discord.Embed(
             title="✅ Bot Enabled",
@@ -32,26 +50,28 @@ class AdminCommands(commands.Cog):
             value="The bot will monitor messages for potentially toxic content and send private reflection prompts to help users pause before posting.",
             inline=False
         )
-        await ctx.send(embed=embed)
+        await interaction.response.send_message(embed=embed)
         
     @pause_group.command(name='disable')
-    @commands.has_permissions(manage_guild=True)
-    async def disable_bot(self, ctx):
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def disable_bot(self, interaction: discord.Interaction):
         """Disable the Reflective Pause Bot for this server"""
-        await self.bot.storage.set_enabled(ctx.guild.id, False)
+        await self.bot.storage.set_enabled(interaction.guild_id, False)
         
         embed = discord.Embed(
             title="❌ Bot Disabled",
             description="Reflective Pause Bot is now inactive in this server.",
             color=0xff6b6b
         )
-        await ctx.send(embed=embed)
+        await interaction.response.send_message(embed=embed)
         
     @pause_group.command(name='status')
-    async def bot_status(self, ctx):
+    async def bot_status(self, interaction: discord.Interaction):
         """Check the current status of the bot"""
-        settings = await self.bot.storage.get_guild_settings(ctx.guild.id)
-        stats = await self.bot.storage.get_guild_stats(ctx.guild.id)
+        settings, stats = await asyncio.gather(
+            self.bot.storage.get_guild_settings(interaction.guild_id),
+            self.bot.storage.get_guild_stats(interaction.guild_id)
+        )
         
         status_color = 0x00ff9f if settings['enabled'] else 0xff6b6b
         status_text = "🟢 Enabled" if settings['enabled'] else "🔴 Disabled"
@@ -97,15 +117,16 @@ class AdminCommands(commands.Cog):
                     inline=False
                 )
         
-        await ctx.send(embed=embed)
+        await interaction.response.send_message(embed=embed)
         
     @pause_group.command(name='config')
-    @commands.has_permissions(manage_guild=True)
-    async def configure_bot(self, ctx, setting: str = None, value: str = None):
+    @app_commands.describe(setting="Setting to change", value="New value for the setting")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def configure_bot(self, interaction: discord.Interaction, setting: Optional[str] = None, value: Optional[str] = None):
         """Configure bot settings for this server"""
         if setting is None:
             # Show current configuration
-            settings = await self.bot.storage.get_guild_settings(ctx.guild.id)
+            settings = await self.bot.storage.get_guild_settings(interaction.guild_id)
             
             embed = discord.Embed(
                 title="⚙️ Current Configuration",
@@ -132,22 +153,25 @@ class AdminCommands(commands.Cog):
                 name="Available Settings",
                 value="`threshold` - Set toxicity sensitivity (0.1-1.0)\n"
                       "`locale` - Set language (en, vi, es, fr, etc.)\n"
-                      "Example: `!pause config threshold 0.8`",
+                      "Example: `/pause config setting:threshold value:0.8`",
                 inline=False
             )
             
-            await ctx.send(embed=embed)
+            await interaction.response.send_message(embed=embed)
             return
             
         # Update configuration
         if setting.lower() == 'threshold':
             try:
+                if value is None:
+                    raise ValueError("a value between 0.1 and 1.0 is required")
+                    
                 threshold = float(value)
                 if not 0.1 <= threshold <= 1.0:
                     raise ValueError("Threshold must be between 0.1 and 1.0")
                     
                 await self.bot.storage.update_guild_settings(
-                    ctx.guild.id, 
+                    interaction.guild_id, 
                     toxicity_threshold=threshold
                 )
                 
@@ -170,20 +194,18 @@ class AdminCommands(commands.Cog):
                         inline=False
                     )
                     
-                await ctx.send(embed=embed)
+                await interaction.response.send_message(embed=embed)
                 
             except ValueError as e:
-                await ctx.send(f"❌ Invalid threshold value: {e}")
+                await interaction.response.send_message(f"❌ Invalid threshold value: {e}")
                 
         elif setting.lower() == 'locale':
-            supported_locales = ['en', 'vi', 'es', 'fr', 'de', 'it', 'ja', 'ko', 'zh', 'ru', 'ar', 'hi', 'pt', 'nl']
-            
-            if value.lower() not in supported_locales:
-                await ctx.send(f"❌ Unsupported locale. Supported: {', '.join(supported_locales)}")
+            if value is None or value.lower() not in SUPPORTED_LOCALES:
+                await interaction.response.send_message(f"❌ Unsupported locale. Supported: {', '.join(sorted(SUPPORTED_LOCALES))}")
                 return
                 
             await self.bot.storage.update_guild_settings(
-                ctx.guild.id,
+                interaction.guild_id,
                 locale=value.lower()
             )
             
@@ -192,18 +214,39 @@ class AdminCommands(commands.Cog):
                 description=f"Language set to {value.upper()}",
                 color=0x00ff9f
             )
-            await ctx.send(embed=embed)
+            await interaction.response.send_message(embed=embed)
             
         else:
-            await ctx.send(f"❌ Unknown setting '{setting}'. Available: threshold, locale")
+            await interaction.response.send_message(f"❌ Unknown setting '{setting}'. Available: threshold, locale")
             
+    @configure_bot.autocomplete('setting')
+    async def setting_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        current = current.lower()
+        return [
+            app_commands.Choice(name=setting, value=setting)
+            for setting in CONFIG_SETTINGS if setting.startswith(current)
+        ]
+        
+    @configure_bot.autocomplete('value')
+    async def value_autocomplete(self, interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
+        if (interaction.namespace.setting or '').lower() != 'locale':
+            return []
+            
+        current = current.lower()
+        return [
+            app_commands.Choice(name=locale, value=locale)
+            for locale in sorted(SUPPORTED_LOCALES) if locale.startswith(current)
+        ]
+        
     @pause_group.command(name='test')
-    @commands.has_permissions(manage_guild=True)
-    async def test_bot(self, ctx, *, message: str = "This is a test message"):
+    @app_commands.describe(message="Message to run through toxicity detection")
+    @app_commands.checks.has_permissions(manage_guild=True)
+    async def test_bot(self, interaction: discord.Interaction, message: str = "This is a test message"):
         """Test the toxicity detection on a message"""
-        from reflectpause_core import check
+        # Classification can take a while; acknowledge within Discord's 3 seconds
+        await interaction.response.defer()
         
-        is_toxic = check(message)
+        is_toxic = await self.bot.check_toxicity(message)
         
         embed = discord.Embed(
             title="🧪 Toxicity Test",
@@ -229,16 +272,16 @@ class AdminCommands(commands.Cog):
                 inline=False
             )
             
-        await ctx.send(embed=embed)
+        await interaction.followup.send(embed=embed)
         
     @pause_group.command(name='stats')
-    async def detailed_stats(self, ctx):
+    async def detailed_stats(self, interaction: discord.Interaction):
         """Show detailed statistics for this server"""
-        stats = await self.bot.storage.get_guild_stats(ctx.guild.id)
+        stats = await self.bot.storage.get_guild_stats(interaction.guild_id)
         
         embed = discord.Embed(
             title="📈 Detailed Statistics",
-            description=f"Data for {ctx.guild.name}",
+            description=f"Data for {interaction.guild.name}",
             color=0x3498db
         )
         
@@ -291,10 +334,10 @@ class AdminCommands(commands.Cog):
                 )
                 
         embed.set_footer(text="Statistics help measure the bot's effectiveness in promoting thoughtful communication")
-        await ctx.send(embed=embed)
+        await interaction.response.send_message(embed=embed)
         
     @pause_group.command(name='help')
-    async def bot_help(self, ctx):
+    async def bot_help(self, interaction: discord.Interaction):
         """Show help information for the bot"""
         embed = discord.Embed(
             title="🤖 Reflective Pause Bot Help",
@@ -304,19 +347,19 @@ class AdminCommands(commands.Cog):
         
         embed.add_field(
             name="🛡️ Admin Commands",
-            value="`!pause enable` - Enable the bot\n"
-                  "`!pause disable` - Disable the bot\n"
-                  "`!pause status` - Check bot status\n"
-                  "`!pause config` - View/change settings\n"
-                  "`!pause test <message>` - Test toxicity detection\n"
-                  "`!pause stats` - View detailed statistics",
+            value="`/pause enable` - Enable the bot\n"
+                  "`/pause disable` - Disable the bot\n"
+                  "`/pause status` - Check bot status\n"
+                  "`/pause config` - View/change settings\n"
+                  "`/pause test <message>` - Test toxicity detection\n"
+                  "`/pause stats` - View detailed statistics",
             inline=False
         )
         
         embed.add_field(
             name="⚙️ Configuration",
-            value="`!pause config threshold 0.7` - Set sensitivity\n"
-                  "`!pause config locale en` - Set language\n"
+            value="`/pause config setting:threshold value:0.7` - Set sensitivity\n"
+                  "`/pause config setting:locale value:en` - Set language\n"
                   "Threshold range: 0.1 (sensitive) to 1.0 (strict)",
             inline=False
         )
@@ -340,7 +383,7 @@ class AdminCommands(commands.Cog):
         )
         
         embed.set_footer(text="For more help: github.com/reflectpause/bot")
-        await ctx.send(embed=embed)
+        await interaction.response.send_message(embed=embed)
 
 async def setup(bot):
     await bot.add_cog(AdminCommands(bot))
\ No newline at end of file
@@ -1,12 +1,72 @@
 import os
 import json
 import logging
-from dataclasses import dataclass, asdict
-from pathlib import Path
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from dataclasses import dataclass, fields
+from typing import Any, Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # Optional faster JSON codec; the stdlib json module is used without it
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Strings that turn a boolean environment variable on
+_TRUE_SET = frozenset({'true', '1', 'yes', 'on'})
+
+def _to_bool(value: str) -> bool:
+    return value.lower() in _TRUE_SET
+
+# (environment variable, BotConfig attribute, converter from the raw string)
+_ENV_TABLE: Tuple[Tuple[str, str, Callable[[str], Any]], ...] = (
+    ('DISCORD_TOKEN', 'discord_token', str),
+    ('PERSPECTIVE_API_KEY', 'perspective_api_key', str),
+    ('TOXICITY_THRESHOLD', 'toxicity_threshold', float),
+    ('USE_PERSPECTIVE_API', 'use_perspective_api', _to_bool),
+    ('DEFAULT_LOCALE', 'default_locale', str),
+    ('PROMPT_TIMEOUT', 'prompt_timeout', int),
+    ('LOG_LEVEL', 'log_level', str),
+    ('LOG_FILE', 'log_file', str),
+    ('DATABASE_PATH', 'database_path', str),
+    ('MAX_PROMPTS_PER_HOUR', 'max_prompts_per_user_per_hour', int),
+    ('COOLDOWN_SECONDS', 'cooldown_between_prompts', int),
+)
+
+# Default config file, relative to the working directory
+_CONFIG_PATH = "config.json"
+
+# Locales the bot has prompts for; also offered by the /pause config command
+SUPPORTED_LOCALES = frozenset({
+    'en', 'vi', 'es', 'fr', 'de', 'it', 'ja', 'ko', 'zh', 'ru', 'ar', 'hi', 'pt', 'nl'
+})
+
+# Written out as null by save_to_file so secrets never land on disk
+_SENSITIVE_KEYS = frozenset({'discord_token', 'perspective_api_key'})
+
+# (check that must hold, error reported when it does not), in report order
+_VALIDATION_RULES: Tuple[Tuple[Callable[['BotConfig'], bool], str], ...] = (
+    # Required settings
+    (lambda c: bool(c.discord_token), "DISCORD_TOKEN is required"),
+    # Ranges
+    (lambda c: 0.0 <= c.toxicity_threshold <= 1.0,
+     "toxicity_threshold must be between 0.0 and 1.0"),
+    (lambda c: c.prompt_timeout >= 60, "prompt_timeout must be at least 60 seconds"),
+    (lambda c: c.max_prompts_per_user_per_hour >= 1,
+     "max_prompts_per_user_per_hour must be at least 1"),
+    (lambda c: c.cooldown_between_prompts >= 0, "cooldown_between_prompts cannot be negative"),
+    # Perspective API settings
+    (lambda c: not c.use_perspective_api or bool(c.perspective_api_key),
+     "perspective_api_key is required when use_perspective_api is True"),
+)
+
+@lru_cache(maxsize=4)
+def _load_file_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a config file; the mtime in the key makes edits a cache miss"""
+    with open(path, 'r') as f:
+        return json.load(f)
+
 @dataclass
 class BotConfig:
     """Bot configuration settings"""
@@ -38,73 +98,72 @@ class BotConfig:
     
     def __post_init__(self):
         """Load configuration from environment variables and config file"""
-        self.load_from_env()
-        self.load_from_file()
-        self.validate()
+        # Constructor values are the base layer every reload starts from, so a
+        # key removed from the file falls back instead of keeping its old value
+        self._defaults = {f.name: getattr(self, f.name) for f in fields(self)}
+        self.reload()
         
-    def load_from_env(self):
-        """Load configuration from environment variables"""
-        env_mappings = {
-            'DISCORD_TOKEN': 'discord_token',
-            'PERSPECTIVE_API_KEY': 'perspective_api_key',
-            'TOXICITY_THRESHOLD': ('toxicity_threshold', float),
-            'USE_PERSPECTIVE_API': ('use_perspective_api', bool),
-            'DEFAULT_LOCALE': 'default_locale',
-            'PROMPT_TIMEOUT': ('prompt_timeout', int),
-            'LOG_LEVEL': 'log_level',
-            'LOG_FILE': 'log_file',
-            'DATABASE_PATH': 'database_path',
-            'MAX_PROMPTS_PER_HOUR': ('max_prompts_per_user_per_hour', int),
-            'COOLDOWN_SECONDS': ('cooldown_between_prompts', int)
-        }
+    def reload(self, config_path: str = _CONFIG_PATH):
+        """Apply defaults, the config file and environment variables in that order, then validate once"""
+        merged = {**self._defaults, **self.load_from_file(config_path), **self.load_from_env()}
+        # Keep the current values so a failed reload leaves the config untouched
+        previous = {f.name: getattr(self, f.name) for f in fields(self)}
+        for key, value in merged.items():
+            setattr(self, key, value)
+            
+        try:
+            self.validate()
+        except Exception:
+            for key, value in previous.items():
+                setattr(self, key, value)
+            raise
         
-        for env_var, config_attr in env_mappings.items():
-            value = os.getenv(env_var)
+    def load_from_env(self) -> Dict[str, Any]:
+        """Read configuration values from environment variables"""
+        values = {}
+        for env_var, attr_name, convert in _ENV_TABLE:
+            value = os.environ.get(env_var)
             if value is not None:
-                if isinstance(config_attr, tuple):
-                    attr_name, attr_type = config_attr
-                    try:
-                        if attr_type == bool:
-                            value = value.lower() in ('true', '1', 'yes', 'on')
-                        else:
-                            value = attr_type(value)
-                        setattr(self, attr_name, value)
-                    except (ValueError, TypeError) as e:
-                        logger.warning(f"Invalid value for {env_var}: {value} ({e})")
-                else:
-                    setattr(self, config_attr, value)
+                try:
+                    values[attr_name] = convert(value)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Invalid value for {env_var}: {value} ({e})")
                     
-    def load_from_file(self, config_path: str = "config.json"):
-        """Load configuration from JSON file"""
-        config_file = Path(config_path)
+        return values
         
-        if config_file.exists():
-            try:
-                with open(config_file, 'r') as f:
-                    config_data = json.load(f)
-                    
-                for key, value in config_data.items():
-                    if hasattr(self, key):
-                        setattr(self, key, value)
-                        
-                logger.info(f"Configuration loaded from {config_path}")
-            except (json.JSONDecodeError, IOError) as e:
-                logger.warning(f"Could not load config file {config_path}: {e}")
+    def load_from_file(self, config_path: str = _CONFIG_PATH) -> Dict[str, Any]:
+        """Read configuration values from a JSON file"""
+        try:
+            mtime_ns = os.stat(config_path).st_mtime_ns
+        except FileNotFoundError:
+            return {}
+            
+        try:
+            # Shared between instances, so copy out of it rather than keep it
+            config_data = _load_file_cached(config_path, mtime_ns)
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"Could not load config file {config_path}: {e}")
+            return {}
+            
+        field_names = {f.name for f in fields(self)}
+        logger.info(f"Configuration loaded from {config_path}")
+        return {key: value for key, value in config_data.items() if key in field_names}
                 
-    def save_to_file(self, config_path: str = "config.json"):
+    def save_to_file(self, config_path: str = _CONFIG_PATH):
         """Save current configuration to JSON file"""
-        config_file = Path(config_path)
-        
         try:
             # Don't save sensitive information
-            config_dict = asdict(self)
-            sensitive_keys = ['discord_token', 'perspective_api_key']
-            for key in sensitive_keys:
-                if key in config_dict:
-                    config_dict[key] = None
-                    
-            with open(config_file, 'w') as f:
-                json.dump(config_dict, f, indent=2)
+            config_dict = {
+                f.name: None if f.name in _SENSITIVE_KEYS else getattr(self, f.name)
+                for f in fields(self)
+            }
+            
+            if orjson is not None:
+                with open(config_path, 'wb') as f:
+                    f.write(orjson.dumps(config_dict, option=orjson.OPT_INDENT_2))
+            else:
+                with open(config_path, 'w') as f:
+                    json.dump(config_dict, f, indent=2)
                 
             logger.info(f"Configuration saved to {config_path}")
         except IOError as e:
@@ -112,32 +171,10 @@ class BotConfig:
             
     def validate(self):
         """Validate configuration settings"""
-        errors = []
+        errors = [message for rule, message in _VALIDATION_RULES if not rule(self)]
         
-        # Required settings
-        if not self.discord_token:
-            errors.append("DISCORD_TOKEN is required")
-            
-        # Validate ranges
-        if not 0.0 <= self.toxicity_threshold <= 1.0:
-            errors.append("toxicity_threshold must be between 0.0 and 1.0")
-            
-        if self.prompt_timeout < 60:
-            errors.append("prompt_timeout must be at least 60 seconds")
-            
-        if self.max_prompts_per_user_per_hour < 1:
-            errors.append("max_prompts_per_user_per_hour must be at least 1")
-            
-        if self.cooldown_between_prompts < 0:
-            errors.append("cooldown_between_prompts cannot be negative")
-            
-        # Validate Perspective API settings
-        if self.use_perspective_api and not self.perspective_api_key:
-            errors.append("perspective_api_key is required when use_perspective_api is True")
-            
         # Validate locale
-        supported_locales = ['en', 'vi', 'es', 'fr', 'de', 'it', 'ja', 'ko', 'zh', 'ru', 'ar', 'hi', 'pt', 'nl']
-        if self.default_locale not in supported_locales:
+        if self.default_locale not in SUPPORTED_LOCALES:
             logger.warning(f"Unsupported locale '{self.default_locale}', falling back to 'en'")
             self.default_locale = 'en'
             
@@ -195,9 +232,14 @@ class BotConfig:
                 
         logger.info(f"Logging configured: level={self.log_level}, file={self.log_file}")
 
-def load_config() -> BotConfig:
-    """Load and return bot configuration"""
-    return BotConfig()
+_config: Optional[BotConfig] = None
+
+def load_config(reload: bool = False) -> BotConfig:
+    """Load and return bot configuration, reusing the first load unless reload is set"""
+    global _config
+    if _config is None or reload:
+        _config = BotConfig()
+    return _config
 
 def create_default_config_file():
     """Create a default configuration file with example values"""
@@ -1,31 +1,181 @@
-import sqlite3
 import json
+import asyncio
 import logging
-from datetime import datetime
-from typing import Dict, Optional, Any
+from collections import defaultdict
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from pathlib import Path
 
+import aiosqlite
+
+try:
+    import orjson
+except ImportError:
+    # Optional faster JSON codec; the stdlib json module is used without it
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Codec for pending_messages.message_data. orjson produces bytes (stored as a
+# BLOB); both decoders accept str and bytes, so existing rows stay readable.
+if orjson is not None:
+    _dumps_message = orjson.dumps
+    _loads_message = orjson.loads
+else:
+    _dumps_message = json.dumps
+    _loads_message = json.loads
+
+# Most pending messages written in a single transaction
+INSERT_BATCH_SIZE = 64
+
+# Size of the connection's prepared statement cache. Every runtime query is
+# a constant below, so each one is parsed and planned once per connection.
+STATEMENT_CACHE_SIZE = 256
+
+SQL_INSERT_PENDING = """
+    INSERT INTO pending_messages (user_id, message_data, expires_at)
+    VALUES (?, ?, datetime('now', ? || ' seconds'))
+"""
+
+SQL_GET_PENDING = """
+    SELECT message_data FROM pending_messages
+    WHERE id = ? AND expires_at > CURRENT_TIMESTAMP
+"""
+
+SQL_DELETE_PENDING = "DELETE FROM pending_messages WHERE id = ?"
+
+# Fetch and delete in one statement (RETURNING needs SQLite 3.35+)
+SQL_POP_PENDING = """
+    DELETE FROM pending_messages
+    WHERE id = ? AND expires_at > CURRENT_TIMESTAMP
+    RETURNING message_data
+"""
+
+SQL_DELETE_EXPIRED = """
+    DELETE FROM pending_messages
+    WHERE expires_at < CURRENT_TIMESTAMP
+"""
+
+SQL_GET_GUILD_SETTINGS = "SELECT * FROM guild_settings WHERE guild_id = ?"
+
+SQL_GET_USER_STATS = "SELECT * FROM user_stats WHERE user_id = ?"
+
+SQL_GET_GUILD_STATS = """
+    SELECT
+        COUNT(*) as total_users,
+        SUM(total_prompts) as total_prompts,
+        SUM(continued_sending) as total_continued,
+        SUM(edited_messages) as total_edited,
+        SUM(cancelled_messages) as total_cancelled
+    FROM user_stats
+"""
+
+# Columns update_guild_settings may write, in the order statements list them
+GUILD_SETTINGS_FIELDS = ('enabled', 'toxicity_threshold', 'locale')
+
+
+def _build_update_settings_sql(fields) -> str:
+    """Upsert only the given settings columns, leaving the others untouched"""
+    columns = ', '.join(fields)
+    placeholders = ', '.join('?' * len(fields))
+    assignments = ', '.join(f"{f} = excluded.{f}" for f in fields)
+    return f"""
+        INSERT INTO guild_settings (guild_id, {columns}, updated_at)
+        VALUES (?, {placeholders}, CURRENT_TIMESTAMP)
+        ON CONFLICT(guild_id) DO UPDATE SET
+            {assignments},
+            updated_at = CURRENT_TIMESTAMP
+    """
+
+
+# One statement per subset of GUILD_SETTINGS_FIELDS, keyed by the subset
+SQL_UPDATE_GUILD_SETTINGS = {
+    fields: _build_update_settings_sql(fields)
+    for n in range(1, len(GUILD_SETTINGS_FIELDS) + 1)
+    for fields in combinations(GUILD_SETTINGS_FIELDS, n)
+}
+
+# record_user_action action name -> user_stats counter column
+ACTION_COLUMNS = {
+    'continued_sending': 'continued_sending',
+    'edited_message': 'edited_messages',
+    'cancelled': 'cancelled_messages'
+}
+
+SQL_RECORD_ACTION = {
+    action: f"""
+        INSERT INTO user_stats (user_id, total_prompts, {column}, last_prompt_at)
+        VALUES (?, 1, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(user_id) DO UPDATE SET
+            total_prompts = total_prompts + 1,
+            {column} = {column} + 1,
+            last_prompt_at = CURRENT_TIMESTAMP
+    """
+    for action, column in ACTION_COLUMNS.items()
+}
+
 class MessageStorage:
-    def __init__(self, db_path: str = "bot_data.db"):
-        self.db_path = Path(db_path)
-        self.db_path.parent.mkdir(exist_ok=True)
+    def __init__(
+        self,
+        db_path: str = "bot_data.db",
+        cleanup_interval: float = 1800.0,
+        message_retention: int = 3600
+    ):
+        # Resolved once; aiosqlite gets a plain string rather than a Path
+        path = Path(db_path).resolve()
+        path.parent.mkdir(exist_ok=True)
+        self.db_path = str(path)
+        # Opened once in initialize() and shared by every query
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._lock = asyncio.Lock()
+        # (user_id, message_blob, future) waiting for the insert flusher
+        self._insert_queue: asyncio.Queue = asyncio.Queue()
+        self._flush_task: Optional[asyncio.Task] = None
+        # Seconds a stored pending message stays retrievable
+        self.message_retention = message_retention
+        # Seconds between expired-message sweeps
+        self.cleanup_interval = cleanup_interval
+        self._cleanup_task: Optional[asyncio.Task] = None
+        # guild_id -> settings row. Every settings write goes through this
+        # class and drops the entry, so cached rows never go stale.
+        self._settings_cache: Dict[int, Dict[str, Any]] = {}
+        self._settings_locks: Dict[int, asyncio.Lock] = defaultdict(asyncio.Lock)
         
     async def initialize(self):
-        """Initialize the database tables"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        """Open the database connection and initialize the tables"""
+        # aiosqlite runs the connection on its own thread, keeping disk I/O
+        # off the event loop
+        self._conn = await aiosqlite.connect(
+            self.db_path,
+            isolation_level=None,  # autocommit; each statement is its own transaction
+            cached_statements=STATEMENT_CACHE_SIZE
+        )
+        self._conn.row_factory = aiosqlite.Row
+        
+        async with self._lock:
+            conn = self._conn
+            await conn.execute("PRAGMA journal_mode=WAL")
+            await conn.execute("PRAGMA synchronous=NORMAL")
+            await conn.execute("PRAGMA temp_store=MEMORY")
+            await conn.execute("PRAGMA cache_size=-20000")
+            
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS pending_messages (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     user_id INTEGER NOT NULL,
-                    message_data TEXT NOT NULL,
+                    message_data BLOB NOT NULL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     expires_at TIMESTAMP NOT NULL
                 )
             """)
             
-            conn.execute("""
+            # Expiry cleanup and the expired check scan by expires_at
+            await conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_pending_expires
+                ON pending_messages(expires_at)
+            """)
+            
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS guild_settings (
                     guild_id INTEGER PRIMARY KEY,
                     enabled BOOLEAN DEFAULT TRUE,
@@ -35,7 +185,7 @@ class MessageStorage:
                 )
             """)
             
-            conn.execute("""
+            await conn.execute("""
                 CREATE TABLE IF NOT EXISTS user_stats (
                     user_id INTEGER PRIMARY KEY,
                     total_prompts INTEGER DEFAULT 0,
@@ -48,86 +198,161 @@ class MessageStorage:
             """)
             
             # Clean up expired messages
-            conn.execute("""
-                DELETE FROM pending_messages 
-                WHERE expires_at < CURRENT_TIMESTAMP
-            """)
+            await conn.execute(SQL_DELETE_EXPIRED)
             
-            conn.commit()
             logger.info("Database initialized successfully")
             
+        self._flush_task = asyncio.create_task(self._flush_pending_inserts())
+        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+            
+    async def close(self):
+        """Close the database connection"""
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            self._cleanup_task = None
+            
+        # Let the flusher write everything queued so far, then stop; None
+        # sorts after every earlier insert in the queue
+        flush_task, self._flush_task = self._flush_task, None
+        if flush_task is not None:
+            await self._insert_queue.put(None)
+            await flush_task
+            
+        if self._conn is not None:
+            async with self._lock:
+                await self._conn.close()
+                self._conn = None
+            
     async def store_pending_message(self, user_id: int, message_data: Dict[str, Any]) -> int:
         """Store a pending message and return its ID"""
-        expires_at = datetime.utcnow().isoformat()
-        
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                INSERT INTO pending_messages (user_id, message_data, expires_at)
-                VALUES (?, ?, datetime('now', '+1 hour'))
-            """, (user_id, json.dumps(message_data)))
+        if self._flush_task is None:
+            raise RuntimeError("MessageStorage is not open")
             
-            conn.commit()
-            return cursor.lastrowid
+        # Inserts queued together share one transaction (and one commit)
+        future = asyncio.get_running_loop().create_future()
+        await self._insert_queue.put((user_id, _dumps_message(message_data), future))
+        return await future
+        
+    async def _flush_pending_inserts(self):
+        """Write queued pending messages in batches, one transaction per batch"""
+        queue = self._insert_queue
+        
+        closing = False
+        while not closing:
+            # Wait for one insert, then take whatever else piled up meanwhile.
+            # A None item from close() ends the loop after this batch.
+            batch = []
+            item = await queue.get()
+            while item is not None:
+                batch.append(item)
+                if len(batch) >= INSERT_BATCH_SIZE or queue.empty():
+                    break
+                item = queue.get_nowait()
+            closing = item is None
+            if not batch:
+                continue
+                
+            try:
+                row_ids = []
+                async with self._lock:
+                    await self._conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        # executemany leaves lastrowid undefined, so insert row by row
+                        for user_id, message_blob, _ in batch:
+                            cursor = await self._conn.execute(
+                                SQL_INSERT_PENDING,
+                                (user_id, message_blob, self.message_retention)
+                            )
+                            row_ids.append(cursor.lastrowid)
+                        await self._conn.execute("COMMIT")
+                    except BaseException:
+                        await self._conn.execute("ROLLBACK")
+                        raise
+            except Exception as e:
+                logger.error(f"Failed to store {len(batch)} pending messages: {e}")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, _, future), row_id in zip(batch, row_ids):
+                    if not future.done():
+                        future.set_result(row_id)
             
     async def get_pending_message(self, message_id: int) -> Optional[Dict[str, Any]]:
         """Retrieve a pending message by ID"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT message_data FROM pending_messages 
-                WHERE id = ? AND expires_at > CURRENT_TIMESTAMP
-            """, (message_id,))
+        async with self._lock:
+            cursor = await self._conn.execute(SQL_GET_PENDING, (message_id,))
             
-            row = cursor.fetchone()
+            row = await cursor.fetchone()
             if row:
-                return json.loads(row[0])
+                return _loads_message(row[0])
             return None
             
     async def remove_pending_message(self, message_id: int):
         """Remove a pending message"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                DELETE FROM pending_messages WHERE id = ?
-            """, (message_id,))
-            conn.commit()
+        async with self._lock:
+            await self._conn.execute(SQL_DELETE_PENDING, (message_id,))
+            
+    async def pop_pending_message(self, message_id: int) -> Optional[Dict[str, Any]]:
+        """Remove a pending message and return its data, or None if it expired"""
+        async with self._lock:
+            cursor = await self._conn.execute(SQL_POP_PENDING, (message_id,))
+            row = await cursor.fetchone()
+            # Drain the statement so the delete is finished before the lock is released
+            await cursor.close()
+            if row:
+                return _loads_message(row[0])
+            return None
             
     async def cleanup_expired_messages(self):
         """Clean up expired pending messages"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                DELETE FROM pending_messages 
-                WHERE expires_at < CURRENT_TIMESTAMP
-            """)
-            conn.commit()
+        async with self._lock:
+            cursor = await self._conn.execute(SQL_DELETE_EXPIRED)
             return cursor.rowcount
             
+    async def _cleanup_loop(self):
+        """Delete expired pending messages every cleanup_interval seconds"""
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                removed = await self.cleanup_expired_messages()
+                logger.debug(f"Removed {removed} expired pending messages")
+            except Exception as e:
+                logger.error(f"Failed to clean up expired messages: {e}")
+                
     async def is_enabled(self, guild_id: int) -> bool:
         """Check if the bot is enabled for a guild"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT enabled FROM guild_settings WHERE guild_id = ?
-            """, (guild_id,))
-            
-            row = cursor.fetchone()
-            return row[0] if row else True  # Default to enabled
+        settings = await self._cached_guild_settings(guild_id)
+        return bool(settings['enabled'])
             
     async def set_enabled(self, guild_id: int, enabled: bool):
         """Enable or disable the bot for a guild"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO guild_settings (guild_id, enabled, updated_at)
-                VALUES (?, ?, CURRENT_TIMESTAMP)
-            """, (guild_id, enabled))
-            conn.commit()
+        await self.update_guild_settings(guild_id, enabled=enabled)
             
     async def get_guild_settings(self, guild_id: int) -> Dict[str, Any]:
         """Get all settings for a guild"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM guild_settings WHERE guild_id = ?
-            """, (guild_id,))
+        return dict(await self._cached_guild_settings(guild_id))
+        
+    async def _cached_guild_settings(self, guild_id: int) -> Dict[str, Any]:
+        """Return the cached settings row for a guild, loading it on a miss"""
+        settings = self._settings_cache.get(guild_id)
+        if settings is not None:
+            return settings
             
-            row = cursor.fetchone()
+        # One loader per guild; concurrent misses wait for it instead of re-querying
+        async with self._settings_locks[guild_id]:
+            settings = self._settings_cache.get(guild_id)
+            if settings is None:
+                settings = await self._load_guild_settings(guild_id)
+                self._settings_cache[guild_id] = settings
+            return settings
+            
+    async def _load_guild_settings(self, guild_id: int) -> Dict[str, Any]:
+        """Read a guild's settings row from the database"""
+        async with self._lock:
+            cursor = await self._conn.execute(SQL_GET_GUILD_SETTINGS, (guild_id,))
+            
+            row = await cursor.fetchone()
             if row:
                 return dict(row)
             else:
@@ -141,56 +366,49 @@ class MessageStorage:
                 
     async def update_guild_settings(self, guild_id: int, **kwargs):
         """Update guild settings"""
-        valid_fields = ['enabled', 'toxicity_threshold', 'locale']
-        updates = {k: v for k, v in kwargs.items() if k in valid_fields}
+        fields = tuple(f for f in GUILD_SETTINGS_FIELDS if f in kwargs)
         
-        if not updates:
+        if not fields:
             return
             
-        set_clause = ', '.join(f"{k} = ?" for k in updates.keys())
-        values = list(updates.values()) + [guild_id]
+        values = [guild_id] + [kwargs[f] for f in fields]
         
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(f"""
-                INSERT OR REPLACE INTO guild_settings 
-                (guild_id, {', '.join(updates.keys())}, updated_at)
-                VALUES (?, {', '.join('?' * len(updates))}, CURRENT_TIMESTAMP)
-            """, values)
-            conn.commit()
+        async with self._settings_locks[guild_id]:
+            async with self._lock:
+                await self._conn.execute(SQL_UPDATE_GUILD_SETTINGS[fields], values)
+            self._settings_cache.pop(guild_id, None)
             
     async def record_user_action(self, user_id: int, action: str):
         """Record a user's decision for analytics"""
-        action_columns = {
-            'continued_sending': 'continued_sending',
-            'edited_message': 'edited_messages', 
-            'cancelled': 'cancelled_messages'
-        }
+        await self.record_user_actions([(user_id, action)])
         
-        column = action_columns.get(action)
-        if not column:
+    async def record_user_actions(self, items: Iterable[Tuple[int, str]]):
+        """Record many (user_id, action) decisions in one transaction"""
+        by_action: Dict[str, List[Tuple[int]]] = defaultdict(list)
+        for user_id, action in items:
+            if action in SQL_RECORD_ACTION:
+                by_action[action].append((user_id,))
+                
+        if not by_action:
             return
             
-        with sqlite3.connect(self.db_path) as conn:
-            # Insert or update user stats
-            conn.execute(f"""
-                INSERT INTO user_stats (user_id, total_prompts, {column}, last_prompt_at)
-                VALUES (?, 1, 1, CURRENT_TIMESTAMP)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    total_prompts = total_prompts + 1,
-                    {column} = {column} + 1,
-                    last_prompt_at = CURRENT_TIMESTAMP
-            """, (user_id,))
-            conn.commit()
+        async with self._lock:
+            await self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Insert or update user stats, one statement per action
+                for action, rows in by_action.items():
+                    await self._conn.executemany(SQL_RECORD_ACTION[action], rows)
+                await self._conn.execute("COMMIT")
+            except BaseException:
+                await self._conn.execute("ROLLBACK")
+                raise
             
     async def get_user_stats(self, user_id: int) -> Dict[str, Any]:
         """Get user statistics"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute("""
-                SELECT * FROM user_stats WHERE user_id = ?
-            """, (user_id,))
+        async with self._lock:
+            cursor = await self._conn.execute(SQL_GET_USER_STATS, (user_id,))
             
-            row = cursor.fetchone()
+            row = await cursor.fetchone()
             if row:
                 return dict(row)
             else:
@@ -205,23 +423,10 @@ class MessageStorage:
                 
     async def get_guild_stats(self, guild_id: int) -> Dict[str, Any]:
         """Get aggregated statistics for a guild"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT 
-                    COUNT(*) as total_users,
-                    SUM(total_prompts) as total_prompts,
-                    SUM(continued_sending) as total_continued,
-                    SUM(edited_messages) as total_edited,
-                    SUM(cancelled_messages) as total_cancelled
-                FROM user_stats
-                WHERE user_id IN (
-                    SELECT DISTINCT user_id FROM pending_messages
-                    UNION
-                    SELECT DISTINCT user_id FROM user_stats
-                )
-            """)
+        async with self._lock:
+            cursor = await self._conn.execute(SQL_GET_GUILD_STATS)
             
-            row = cursor.fetchone()
+            row = await cursor.fetchone()
             if row:
                 return {
                     'total_users': row[0] or 0,
@@ -5,7 +5,7 @@ A shared Python library providing toxicity checking and prompt generation
 for the Reflective Pause Bot system.
 """
 
-from .core import check, generate_prompt, log_decision
+from .core import check, check_batch, generate_prompt, log_decision
 from .async_core import (
     check_async, check_batch_async, generate_prompt_async, log_decision_async,
     check_with_prompt_async, complete_workflow_async, AsyncToxicityChecker
@@ -22,7 +22,7 @@ from .prompts.generator import (
 __version__ = "0.3.0"
 __all__ = [
     # Core sync functions
-    "check", "generate_prompt", "log_decision",
+    "check", "check_batch", "generate_prompt", "log_decision",
     
     # Async functions
     "check_async", "check_batch_async", "generate_prompt_async", "log_decision_async",
@@ -6,7 +6,7 @@ Provides the main API that both browser extension and Discord bot use.
 
 import logging
 import time
-from typing import Optional
+from typing import List, Optional, Tuple
 from enum import Enum
 
 from .toxicity.engine import ToxicityEngine
@@ -15,7 +15,7 @@ from .prompts.generator import generate_prompt as _generate_prompt, PromptData
 from .logging.decision_logger import log_decision as _log_decision, DecisionType
 from .cache.toxicity_cache import get_global_cache
 from .metrics.collector import get_global_collector
-from .config.manager import get_global_config
+from .config.manager import ConfigManager, get_global_config
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,26 @@ logger = logging.getLogger(__name__)
 _toxicity_engine: Optional[ToxicityEngine] = None
 
 
+def _resolve_check_settings(config: ConfigManager, threshold: Optional[float], always_prompt: Optional[bool]) -> Tuple[float, bool]:
+    """Fill in threshold and always_prompt from config and validate the threshold."""
+    # Use config defaults if not specified
+    if threshold is None:
+        threshold = config.toxicity.default_threshold
+    if always_prompt is None:
+        always_prompt = config.toxicity.always_prompt
+    
+    if not 0.0 <= threshold <= 1.0:
+        raise ValueError("Threshold must be between 0.0 and 1.0")
+    
+    return threshold, always_prompt
+
+
+def _warn_if_slow(config: ConfigManager, duration_ms: float, label: str = "Toxicity check") -> None:
+    """Log a warning when a check exceeds the configured latency target."""
+    if config.toxicity.performance_monitoring and duration_ms > config.toxicity.latency_warning_threshold_ms:
+        logger.warning(f"{label} exceeded {config.toxicity.latency_warning_threshold_ms}ms latency target: {duration_ms:.1f}ms")
+
+
 def check(text: str, threshold: Optional[float] = None, always_prompt: Optional[bool] = None) -> bool:
     """
     Check if text exceeds toxicity threshold or user has always-prompt setting.
@@ -44,15 +64,7 @@ def check(text: str, threshold: Optional[float] = None, always_prompt: Optional[
     
     # Load configuration
     config = get_global_config()
-    
-    # Use config defaults if not specified
-    if threshold is None:
-        threshold = config.toxicity.default_threshold
-    if always_prompt is None:
-        always_prompt = config.toxicity.always_prompt
-    
-    if not 0.0 <= threshold <= 1.0:
-        raise ValueError("Threshold must be between 0.0 and 1.0")
+    threshold, always_prompt = _resolve_check_settings(config, threshold, always_prompt)
     
     if always_prompt:
         logger.info("Always-prompt setting enabled, returning True")
@@ -97,8 +109,7 @@ def check(text: str, threshold: Optional[float] = None, always_prompt: Optional[
         )
         
         # Performance warning based on config
-        if config.toxicity.performance_monitoring and duration_ms > config.toxicity.latency_warning_threshold_ms:
-            logger.warning(f"Toxicity check exceeded {config.toxicity.latency_warning_threshold_ms}ms latency target: {duration_ms:.1f}ms")
+        _warn_if_slow(config, duration_ms)
         
         return result
         
@@ -124,6 +135,108 @@ def check(text: str, threshold: Optional[float] = None, always_prompt: Optional[
         raise RuntimeError(f"Failed to analyze text: {e}")
 
 
+def check_batch(texts: List[str], threshold: Optional[float] = None, always_prompt: Optional[bool] = None) -> List[bool]:
+    """
+    Check multiple texts for toxicity with a single engine call.
+    
+    Cached scores are reused and the remaining texts are scored together via
+    the engine's analyze_batch, so batch-capable engines pay tokenization and
+    inference setup once per batch instead of once per text.
+    
+    Args:
+        texts: List of texts to analyze for toxicity
+        threshold: Toxicity threshold (0.0-1.0). If None, uses config default.
+        always_prompt: If True, always return True regardless of toxicity. If None, uses config default.
+        
+    Returns:
+        List of boolean results corresponding to input texts
+        
+    Raises:
+        ValueError: If any text is empty or threshold is invalid
+        RuntimeError: If toxicity engine fails
+    """
+    if not texts:
+        return []
+    
+    for i, text in enumerate(texts):
+        if not text or not text.strip():
+            raise ValueError(f"Text at index {i} cannot be empty")
+    
+    # Load configuration
+    config = get_global_config()
+    threshold, always_prompt = _resolve_check_settings(config, threshold, always_prompt)
+    
+    if always_prompt:
+        logger.info("Always-prompt setting enabled, returning True for all texts")
+        return [True] * len(texts)
+    
+    start_time = time.perf_counter()
+    
+    try:
+        global _toxicity_engine
+        if _toxicity_engine is None:
+            _toxicity_engine = ONNXEngine()
+        
+        engine_type = _toxicity_engine.engine_type
+        cache = get_global_cache()
+        scores = [cache.get(text, engine_type) for text in texts]
+        misses = [i for i, score in enumerate(scores) if score is None]
+        
+        if misses:
+            fresh_scores = _toxicity_engine.analyze_batch([texts[i] for i in misses])
+            for i, score in zip(misses, fresh_scores):
+                scores[i] = score
+                cache.put(texts[i], engine_type, score)
+        
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        logger.debug(f"Batch toxicity check: {len(texts)} texts, {len(misses)} analyzed, duration={duration_ms:.1f}ms")
+        
+        # Record metrics, spreading the batch duration evenly over its texts
+        metrics_collector = get_global_collector()
+        per_text_ms = duration_ms / len(texts)
+        analyzed = set(misses)
+        results = []
+        for i, (text, score) in enumerate(zip(texts, scores)):
+            result = score > threshold
+            metrics_collector.record_toxicity_check(
+                text=text,
+                result=result,
+                score=score,
+                threshold=threshold,
+                engine_type=engine_type,
+                duration_ms=per_text_ms,
+                was_cached=i not in analyzed
+            )
+            results.append(result)
+        
+        # Performance warning based on config; the caller waits for the whole batch
+        _warn_if_slow(config, duration_ms, label=f"Batch toxicity check of {len(texts)} texts")
+        
+        return results
+        
+    except Exception as e:
+        # Record the error for every text in the failed batch
+        per_text_ms = (time.perf_counter() - start_time) * 1000 / len(texts)
+        metrics_collector = get_global_collector()
+        
+        engine_type = _toxicity_engine.engine_type if _toxicity_engine else "unknown"
+        
+        for text in texts:
+            metrics_collector.record_toxicity_check(
+                text=text,
+                result=False,
+                score=0.0,
+                threshold=threshold,
+                engine_type=engine_type,
+                duration_ms=per_text_ms,
+                was_cached=False,
+                error=e
+            )
+        
+        logger.error(f"Batch toxicity check failed: {e}")
+        raise RuntimeError(f"Failed to analyze texts: {e}")
+
+
 def generate_prompt(locale: str = "en") -> PromptData:
     """
     Generate a localized CBT prompt with question rotation.
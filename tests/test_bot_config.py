@@ -0,0 +1,80 @@
+"""
+Tests for the Discord bot configuration loader.
+"""
+
+import json
+
+import pytest
+
+from discord_bot import config as bot_config
+from discord_bot.config import BotConfig
+
+
+@pytest.fixture
+def config_env(tmp_path, monkeypatch):
+    """Run in an empty directory with only DISCORD_TOKEN set."""
+    monkeypatch.chdir(tmp_path)
+    for env_var, _, _ in bot_config._ENV_TABLE:
+        monkeypatch.delenv(env_var, raising=False)
+    monkeypatch.setenv("DISCORD_TOKEN", "test-token")
+    return tmp_path
+
+
+def write_config(path, data):
+    """Write a config file and return its path as a string."""
+    path.write_text(json.dumps(data))
+    return str(path)
+
+
+class TestBotConfigReload:
+    """Tests for BotConfig.reload()."""
+
+    def test_environment_overrides_config_file(self, config_env, monkeypatch):
+        """Test that environment variables take precedence over the file."""
+        write_config(config_env / "config.json", {"toxicity_threshold": 0.5, "prompt_timeout": 120})
+        monkeypatch.setenv("TOXICITY_THRESHOLD", "0.2")
+
+        config = BotConfig()
+
+        assert config.toxicity_threshold == 0.2
+        assert config.prompt_timeout == 120
+
+    def test_removed_file_key_falls_back_to_default(self, config_env):
+        """Test that a key dropped from the file resets to its default on reload."""
+        path = write_config(config_env / "settings.json", {"log_level": "DEBUG"})
+        config = BotConfig()
+        config.reload(path)
+        assert config.log_level == "DEBUG"
+
+        write_config(config_env / "settings.json", {})
+        config.reload(path)
+
+        assert config.log_level == "INFO"
+
+    def test_constructor_values_survive_reload(self, config_env):
+        """Test that values passed to the constructor are the reload base layer."""
+        config = BotConfig(prompt_timeout=600)
+        config.reload(write_config(config_env / "settings.json", {}))
+
+        assert config.prompt_timeout == 600
+
+    def test_failed_validation_restores_previous_values(self, config_env):
+        """Test that a reload rejected by validate() leaves the config unchanged."""
+        config = BotConfig()
+        path = write_config(config_env / "bad.json", {"toxicity_threshold": 5, "log_level": "DEBUG"})
+
+        with pytest.raises(ValueError, match="toxicity_threshold"):
+            config.reload(path)
+
+        assert config.toxicity_threshold == 0.7
+        assert config.log_level == "INFO"
+
+    def test_wrongly_typed_value_restores_previous_values(self, config_env):
+        """Test that a reload failing with a non-ValueError also rolls back."""
+        config = BotConfig()
+        path = write_config(config_env / "bad.json", {"toxicity_threshold": "0.6"})
+
+        with pytest.raises(TypeError):
+            config.reload(path)
+
+        assert config.toxicity_threshold == 0.7
@@ -0,0 +1,133 @@
+"""
+Tests for the Discord bot's SQLite message storage.
+"""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from discord_bot.storage import MessageStorage
+
+
+def run(coro):
+    """Run a coroutine to completion, failing instead of hanging."""
+    return asyncio.run(asyncio.wait_for(coro, timeout=10))
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    """Path to a fresh database file."""
+    return str(tmp_path / "bot_data.db")
+
+
+class TestPendingMessageInserts:
+    """Tests for the batched pending-message insert path."""
+
+    def test_concurrent_stores_get_distinct_ids_in_order(self, db_path):
+        """Test that stores queued together get ids in call order."""
+        async def scenario():
+            storage = MessageStorage(db_path)
+            await storage.initialize()
+            try:
+                ids = await asyncio.gather(*(
+                    storage.store_pending_message(i, {"content": f"message {i}"})
+                    for i in range(150)
+                ))
+                stored = [await storage.get_pending_message(row_id) for row_id in ids]
+            finally:
+                await storage.close()
+            return ids, stored
+
+        ids, stored = run(scenario())
+
+        assert len(set(ids)) == 150
+        assert ids == sorted(ids)
+        assert stored == [{"content": f"message {i}"} for i in range(150)]
+
+    def test_close_resolves_queued_stores(self, db_path):
+        """Test that close() writes stores still queued instead of dropping them."""
+        async def scenario():
+            storage = MessageStorage(db_path)
+            await storage.initialize()
+            tasks = [
+                asyncio.create_task(storage.store_pending_message(1, {"n": i}))
+                for i in range(100)
+            ]
+            # Let every store reach the queue before closing
+            await asyncio.sleep(0)
+            await storage.close()
+            ids = await asyncio.gather(*tasks)
+
+            reopened = MessageStorage(db_path)
+            await reopened.initialize()
+            try:
+                last = await reopened.get_pending_message(ids[-1])
+            finally:
+                await reopened.close()
+            return ids, last
+
+        ids, last = run(scenario())
+
+        assert len(set(ids)) == 100
+        assert last == {"n": 99}
+
+    def test_store_after_close_raises(self, db_path):
+        """Test that storing on a closed storage fails instead of hanging."""
+        async def scenario():
+            storage = MessageStorage(db_path)
+            await storage.initialize()
+            await storage.close()
+            await storage.store_pending_message(1, {"content": "late"})
+
+        with pytest.raises(RuntimeError, match="not open"):
+            run(scenario())
+
+
+class TestGuildSettings:
+    """Tests for guild settings writes."""
+
+    def test_set_enabled_keeps_other_settings(self, db_path):
+        """Test that toggling enabled leaves threshold and locale untouched."""
+        async def scenario():
+            storage = MessageStorage(db_path)
+            await storage.initialize()
+            try:
+                await storage.update_guild_settings(42, toxicity_threshold=0.4, locale="fr")
+                await storage.set_enabled(42, False)
+            finally:
+                await storage.close()
+
+            # Read through a new instance so the settings cache is not involved
+            reopened = MessageStorage(db_path)
+            await reopened.initialize()
+            try:
+                return await reopened.get_guild_settings(42)
+            finally:
+                await reopened.close()
+
+        settings = run(scenario())
+
+        assert not settings["enabled"]
+        assert settings["toxicity_threshold"] == 0.4
+        assert settings["locale"] == "fr"
+
+    def test_update_guild_settings_changes_only_given_fields(self, db_path):
+        """Test that a partial update binds guild_id correctly and keeps other fields."""
+        async def scenario():
+            storage = MessageStorage(db_path)
+            await storage.initialize()
+            try:
+                await storage.set_enabled(7, False)
+                await storage.update_guild_settings(7, locale="vi")
+                return await storage.get_guild_settings(7)
+            finally:
+                await storage.close()
+
+        settings = run(scenario())
+
+        assert settings["guild_id"] == 7
+        assert not settings["enabled"]
+        assert settings["locale"] == "vi"
+        assert settings["toxicity_threshold"] == 0.7
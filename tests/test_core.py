@@ -5,7 +5,7 @@ Tests for core module functions.
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
-from reflectpause_core import check, generate_prompt, log_decision
+from reflectpause_core import check, check_batch, generate_prompt, log_decision, clear_global_cache
 from reflectpause_core.core import _toxicity_engine
 from reflectpause_core.logging import DecisionType
 
@@ -76,6 +76,95 @@ class TestCheckFunction:
             check("test message")
 
 
+class TestCheckBatchFunction:
+    """Tests for the check_batch() function."""
+    
+    def setup_method(self):
+        """Start every test with an empty toxicity cache."""
+        clear_global_cache()
+    
+    def test_check_batch_with_no_texts_returns_empty_list(self):
+        """Test that an empty batch returns an empty list."""
+        assert check_batch([]) == []
+    
+    def test_check_batch_with_empty_text_raises_error(self):
+        """Test that any empty text in the batch raises ValueError."""
+        with pytest.raises(ValueError, match="Text at index 1 cannot be empty"):
+            check_batch(["hello", "   "])
+    
+    def test_check_batch_with_always_prompt_returns_true(self):
+        """Test that always_prompt=True returns True for every text."""
+        assert check_batch(["a message", "another"], always_prompt=True) == [True, True]
+    
+    @patch('reflectpause_core.core.ONNXEngine')
+    def test_check_batch_scores_texts_in_one_engine_call(self, mock_onnx_engine):
+        """Test that uncached texts are analyzed together with analyze_batch."""
+        mock_engine_instance = Mock()
+        mock_engine_instance.engine_type = "mock"
+        mock_engine_instance.analyze_batch.return_value = [0.2, 0.9]
+        mock_onnx_engine.return_value = mock_engine_instance
+        
+        import reflectpause_core.core
+        reflectpause_core.core._toxicity_engine = None
+        
+        result = check_batch(["friendly message", "toxic message"], threshold=0.5)
+        
+        mock_engine_instance.analyze_batch.assert_called_once_with(["friendly message", "toxic message"])
+        mock_engine_instance.analyze.assert_not_called()
+        assert result == [False, True]
+    
+    @patch('reflectpause_core.core.ONNXEngine')
+    def test_check_batch_only_analyzes_uncached_texts(self, mock_onnx_engine):
+        """Test that cached scores are reused instead of re-analyzed."""
+        mock_engine_instance = Mock()
+        mock_engine_instance.engine_type = "mock"
+        mock_engine_instance.analyze_batch.side_effect = [[0.9], [0.1]]
+        mock_onnx_engine.return_value = mock_engine_instance
+        
+        import reflectpause_core.core
+        reflectpause_core.core._toxicity_engine = None
+        
+        check_batch(["toxic message"], threshold=0.5)
+        result = check_batch(["toxic message", "new message"], threshold=0.5)
+        
+        mock_engine_instance.analyze_batch.assert_called_with(["new message"])
+        assert result == [True, False]
+    
+    @patch('reflectpause_core.core.ONNXEngine')
+    def test_check_batch_handles_engine_failure(self, mock_onnx_engine):
+        """Test that engine failures surface as RuntimeError."""
+        mock_onnx_engine.side_effect = Exception("Engine failed")
+        
+        import reflectpause_core.core
+        reflectpause_core.core._toxicity_engine = None
+        
+        with pytest.raises(RuntimeError, match="Failed to analyze texts"):
+            check_batch(["test message"])
+
+    @patch('reflectpause_core.core.get_global_collector')
+    @patch('reflectpause_core.core.ONNXEngine')
+    def test_check_batch_records_error_metrics(self, mock_onnx_engine, mock_get_collector):
+        """Test that a failed batch records an error metric for every text."""
+        error = Exception("Inference failed")
+        mock_engine_instance = Mock()
+        mock_engine_instance.engine_type = "mock"
+        mock_engine_instance.analyze_batch.side_effect = error
+        mock_onnx_engine.return_value = mock_engine_instance
+        mock_collector = Mock()
+        mock_get_collector.return_value = mock_collector
+
+        import reflectpause_core.core
+        reflectpause_core.core._toxicity_engine = None
+
+        with pytest.raises(RuntimeError, match="Failed to analyze texts"):
+            check_batch(["first message", "second message"], threshold=0.5)
+
+        calls = mock_collector.record_toxicity_check.call_args_list
+        assert [c.kwargs['text'] for c in calls] == ["first message", "second message"]
+        assert all(c.kwargs['error'] is error for c in calls)
+        assert all(c.kwargs['engine_type'] == "mock" for c in calls)
+
+
 class TestGeneratePromptFunction:
     """Tests for the generate_prompt() function."""
     